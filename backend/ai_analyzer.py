@@ -1,20 +1,505 @@
 """AI-powered analysis of PowerPoint presentations using OpenAI API."""
 import asyncio
+import functools
+import hashlib
+import json
 import logging
-from typing import Dict, List
-from openai import OpenAI, AsyncOpenAI
+import math
+import re
+import time
+from collections import deque
+from typing import Dict, List, Optional
+import orjson
+from openai import OpenAI
 from config import settings
+import openai_transport
+from openai_transport import OpenAIRateLimitError
 
 logger = logging.getLogger(__name__)
 
+# Matches numbered suggestion lines like "1. ...", "2) ..." in fallback parsing
+_NUM_RE = re.compile(r"^\s*\d+[.\-) ]\s*(.+)")
+
+# Static prompt text is hoisted into module constants and the variable
+# slide fields are appended at the very end of each user message. OpenAI's
+# server-side prompt caching activates for shared prefixes >= 1024 tokens,
+# so every call after the first in a deck hits the prefill cache. The
+# shared rubric below pads the system message past that threshold.
+_SCORING_RUBRIC = """Apply the following scoring rubric consistently in all evaluations.
+
+Content Clarity (0-100):
+- 90-100: The slide communicates exactly one central idea. The title states the takeaway, not just the topic. Every bullet or sentence directly supports that idea. A reader who sees the slide for five seconds can repeat its message accurately.
+- 70-89: The main idea is identifiable but diluted. The title labels the topic rather than the conclusion, or one or two bullets drift into secondary material that belongs on another slide.
+- 40-69: Multiple competing ideas share the slide. The audience must infer the point from a list of loosely related facts. Jargon or unexplained acronyms appear without definition.
+- 0-39: No discernible central message. Text reads as speaker notes pasted onto the slide, or the content contradicts its own title.
+
+Engagement (0-100):
+- 90-100: The slide gives the audience a reason to care in the first line. Concrete numbers, named examples, or a vivid comparison anchor the abstract claims. Text is scannable: short lines, parallel grammatical structure, strong verbs.
+- 70-89: Content is relevant but presented passively. Claims are plausible yet unsupported by a number, example, or visual. Bullet phrasing is inconsistent (mixed fragments and full sentences).
+- 40-69: Dense blocks of text force reading instead of listening. No hierarchy signals what matters most. The audience's question "so what?" goes unanswered.
+- 0-39: Wall of text, boilerplate filler, or content with no connection to an audience need.
+
+Design and Density (0-100):
+- 90-100: Comfortable white space, a clear visual hierarchy, and font sizes readable from the back of a room (titles >= 28pt, body >= 18pt). Images and diagrams carry meaning rather than decorate. Roughly 20-80 words of body text.
+- 70-89: Generally readable with minor crowding. One element (a long bullet, a small caption, an oversized logo) disrupts the hierarchy. Word count slightly above the comfortable range.
+- 40-69: Overcrowded or nearly empty. Font sizes below 14pt, more than 120 words, or large regions of unused space with no visual anchor. Decorative images that add no information.
+- 0-39: Unreadable at presentation distance: tiny fonts, clashing colors, overlapping elements, or more than 200 words on a single slide.
+
+Structural Flow (0-100, presentation level):
+- 90-100: Slides follow a recognizable arc: context, problem or opportunity, evidence, resolution, call to action. Each slide title advances the argument, and section transitions are explicit.
+- 70-89: The overall arc is present but individual slides are out of order, or a section lacks a transition and the audience must reconstruct the connection.
+- 40-69: Slides read as an unordered collection. The opening does not frame the problem, or the ending lacks a conclusion and next steps.
+- 0-39: No detectable organization; the deck could be shuffled without changing its effect.
+
+Titles and Language:
+- Prefer assertion titles ("Churn fell 12% after onboarding redesign") over label titles ("Churn update"); score clarity higher when the title alone carries the conclusion.
+- Penalize hedging filler ("various", "numerous", "a number of"), stacked adjectives, and sentences longer than ~20 words in body text.
+- Bullet lists should be grammatically parallel: all fragments or all sentences, all starting with the same part of speech. Mixed forms cost engagement points.
+- Acronyms must be expanded on first use within the deck; an unexpanded acronym on an early slide is a clarity defect, the same acronym later is acceptable.
+
+Data, Charts, and Evidence:
+- Every quantitative claim needs a number, a source, or a chart reference on the slide; "significant improvement" with no figure is unsupported.
+- A chart mentioned in the text should state its takeaway in the title or an annotation, not force the audience to decode axes live.
+- Flag precision theater (e.g. "47.3218%") and unlabeled axes or units as design defects; flag cherry-picked ranges or missing baselines as clarity defects.
+- Tables with more than ~4 columns or ~6 rows on a slide are almost always better as a chart or an appendix; recommend the conversion explicitly.
+
+Consistency Across the Deck (presentation level):
+- Terminology must be stable: the same product, metric, or team should keep one name from the first slide to the last.
+- Recurring elements (section headers, agenda markers, slide numbers) should appear in the same position and style throughout; drift suggests merged decks and costs coherence points.
+- The opening should promise a specific set of questions and the closing should visibly answer them; score coherence down when promised topics never return.
+- Depth should match billing: a topic given three words on the agenda but ten slides in the body (or the reverse) is a structural imbalance worth a recommendation.
+
+General guidance:
+- Be specific: cite the slide element (title, bullet, image, chart) that motivates each score and each suggestion.
+- Be constructive: every weakness you identify must be paired with a concrete, actionable fix a presenter could apply in minutes.
+- Be calibrated: reserve scores above 90 for genuinely excellent work; a typical competent slide scores in the 70s.
+- Be proportionate: lead with the one or two changes that would most improve the slide rather than an exhaustive list of nitpicks.
+- Never invent content that is not on the slide; evaluate only what is provided.
+- Keep feedback text compact: scores carry the magnitude, prose carries the reason."""
+
+_JSON_ONLY = "\n\nRespond with a single JSON object matching the requested schema."
+
+_SLIDE_COACH_SYSTEM = "You are an expert presentation coach.\n\n" + _SCORING_RUBRIC + _JSON_ONLY
+
+_STRUCTURE_SYSTEM = "You are a presentation strategy expert.\n\n" + _SCORING_RUBRIC + _JSON_ONLY
+
+_DESIGNER_SYSTEM = "You are a professional presentation designer.\n\n" + _SCORING_RUBRIC + _JSON_ONLY
+
+_SLIDE_EXPERT_SYSTEM = "You are a presentation expert.\n\n" + _SCORING_RUBRIC + _JSON_ONLY
+
+_SLIDE_ANALYSIS_INSTRUCTIONS = """Analyze the PowerPoint slide provided at the end of this message and give constructive feedback.
+
+Please provide:
+1. Content Clarity Score (0-100)
+2. Engagement Score (0-100)
+3. Key strengths (list 2-3 points)
+4. Areas for improvement (list 2-3 points)
+5. Specific suggestions for enhancement
+
+Format response as JSON.
+
+"""
+
+_STRUCTURE_INSTRUCTIONS = """Analyze the overall structure and flow of the presentation outlined at the end of this message.
+
+Please evaluate:
+1. Logical Flow Score (0-100)
+2. Message Clarity Score (0-100)
+3. Presentation Coherence Score (0-100)
+4. Overall Assessment (brief paragraph)
+5. Top 3 Recommendations for improvement
+
+Format response as JSON.
+
+"""
+
+_SUGGESTIONS_INSTRUCTIONS = """Provide 5 specific, actionable suggestions to improve the slide provided at the end of this message.
+
+Focus on:
+- Visual improvements
+- Content clarity
+- Audience engagement
+- Design best practices
+
+Return a JSON object of the form {"suggestions": ["...", ...]}, where each string is one specific suggestion.
+
+"""
+
+_SLIDE_RATING_INSTRUCTIONS = """Analyze the slide provided at the end of this message and rate its quality (0-100) in: clarity, engagement, design.
+
+Respond with JSON: {"clarity": X, "engagement": Y, "design": Z, "feedback": "..."}
+
+"""
+
+_SLIDE_GROUP_INSTRUCTIONS = """Analyze each of the slides provided at the end of this message and rate every slide's quality (0-100) in: clarity, engagement, design.
+
+Respond with a JSON object of the form:
+{"slides": [{"slide_number": N, "clarity": X, "engagement": Y, "design": Z, "feedback": "..."}, ...]}
+containing exactly one entry per slide, in the same order the slides are given.
+
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def get_sync_client() -> OpenAI:
+    """Get the process-wide sync OpenAI client.
+
+    A single client shares its connection pool across all analyzers and
+    requests, so TCP/TLS setup is paid once. The async side is handled by
+    the shared session in openai_transport.
+    """
+    return OpenAI(api_key=settings.openai_api_key)
+
+
+class PromptCache:
+    """Cache of model responses keyed on prompt content.
+
+    Decks reuse boilerplate slides (title, agenda, thank-you, dividers)
+    whose prompts repeat verbatim, so an exact-match hit skips the LLM
+    round-trip entirely. An optional embedding-similarity path catches
+    near-duplicates above a cosine threshold.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum cached responses before evicting oldest
+        """
+        self._max_entries = max_entries
+        self._entries: Dict[str, str] = {}
+        self._order: deque = deque()
+        # Recent (embedding, response) pairs for the fuzzy path
+        self._embeddings: deque = deque(maxlen=256)
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, user_prompt: str) -> str:
+        """Build the exact-match cache key for a prompt."""
+        raw = f"{model}|{system_prompt}|{user_prompt}"
+        return hashlib.blake2b(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response by exact key."""
+        return self._entries.get(key)
+
+    def put(self, key: str, response: str):
+        """Store a response, evicting the oldest entry when full."""
+        if key not in self._entries:
+            self._order.append(key)
+            if len(self._order) > self._max_entries:
+                self._entries.pop(self._order.popleft(), None)
+        self._entries[key] = response
+
+    def get_similar(self, embedding: List[float], threshold: float) -> Optional[str]:
+        """Look up a cached response by embedding similarity.
+
+        Args:
+            embedding: Prompt embedding vector
+            threshold: Minimum cosine similarity for a hit
+
+        Returns:
+            The cached response, or None if nothing is close enough
+        """
+        best_score = threshold
+        best_response = None
+        norm = math.sqrt(sum(x * x for x in embedding))
+        if not norm:
+            return None
+        for cached_embedding, response in self._embeddings:
+            dot = sum(a * b for a, b in zip(embedding, cached_embedding))
+            cached_norm = math.sqrt(sum(x * x for x in cached_embedding))
+            if not cached_norm:
+                continue
+            score = dot / (norm * cached_norm)
+            if score >= best_score:
+                best_score = score
+                best_response = response
+        return best_response
+
+    def put_embedding(self, embedding: List[float], response: str):
+        """Store an (embedding, response) pair for similarity lookups."""
+        self._embeddings.append((embedding, response))
+
+
+_prompt_cache = PromptCache()
+
 
 class AIAnalyzer:
     """Analyze presentations using OpenAI's language models."""
 
     def __init__(self):
-        """Initialize OpenAI client."""
-        self.client = OpenAI(api_key=settings.openai_api_key)
-        self.async_client = AsyncOpenAI(api_key=settings.openai_api_key)
+        """Initialize concurrency and rate-limit state."""
+        # Cap in-flight requests and track sliding one-minute windows so
+        # large decks stay under the account's RPM/TPM ceilings instead of
+        # triggering 429 storms
+        self._sem = asyncio.Semaphore(settings.max_concurrent_openai)
+        self._request_times: deque = deque()
+        self._token_usage: deque = deque()
+        self._limits_lock = asyncio.Lock()
+
+    async def _wait_for_rate_slot(self, estimated_tokens: int):
+        """Block until a request fits in the per-minute rate windows.
+
+        Args:
+            estimated_tokens: Rough token cost reserved for the request
+        """
+        while True:
+            async with self._limits_lock:
+                now = time.monotonic()
+                while self._request_times and now - self._request_times[0] > 60:
+                    self._request_times.popleft()
+                while self._token_usage and now - self._token_usage[0][0] > 60:
+                    self._token_usage.popleft()
+
+                tokens_in_window = sum(t for _, t in self._token_usage)
+                if (len(self._request_times) < settings.max_requests_per_min
+                        and tokens_in_window + estimated_tokens <= settings.max_tokens_per_min):
+                    self._request_times.append(now)
+                    self._token_usage.append((now, estimated_tokens))
+                    return
+
+                wait = 60 - (now - self._request_times[0]) if self._request_times else 1.0
+            await asyncio.sleep(max(wait, 0.1))
+
+    async def _chat_completion_async(self, estimated_tokens: int = 1000, **kwargs):
+        """Issue a chat completion under the concurrency and rate limits.
+
+        Retries rate-limited requests with exponential backoff (up to 5
+        attempts), honoring the Retry-After header when present.
+
+        Args:
+            estimated_tokens: Rough token cost used by the rate limiter
+            **kwargs: Arguments forwarded to chat.completions.create
+        """
+        delay = 1.0
+        for attempt in range(5):
+            await self._wait_for_rate_slot(estimated_tokens)
+            try:
+                async with self._sem:
+                    return await openai_transport.create_chat_completion(**kwargs)
+            except OpenAIRateLimitError as e:
+                retry_after = e.retry_after if e.retry_after else delay
+                logger.warning(f"Rate limited (attempt {attempt + 1}/5), retrying in {retry_after:.1f}s")
+                await asyncio.sleep(retry_after)
+                delay = min(delay * 2, 30.0)
+
+        # Final attempt; let the error propagate to the caller
+        await self._wait_for_rate_slot(estimated_tokens)
+        async with self._sem:
+            return await openai_transport.create_chat_completion(**kwargs)
+
+    def _cache_lookup(self, cache_key: str, prompt: str):
+        """Check the prompt cache, exact match first then semantic.
+
+        Args:
+            cache_key: Exact-match key from PromptCache.make_key
+            prompt: User prompt, embedded when the semantic path is enabled
+
+        Returns:
+            Tuple of (cached response or None, prompt embedding or None);
+            the embedding is returned so a miss can be stored after the
+            real completion arrives
+        """
+        cached = _prompt_cache.get(cache_key)
+        if cached is not None:
+            return cached, None
+
+        if not settings.enable_semantic_cache:
+            return None, None
+
+        try:
+            embedding = get_sync_client().embeddings.create(
+                model="text-embedding-3-small",
+                input=prompt,
+            ).data[0].embedding
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {str(e)}")
+            return None, None
+
+        return _prompt_cache.get_similar(embedding, settings.semantic_cache_threshold), embedding
+
+    async def analyze_slides_batch(self, slides: List[Dict], k: int = 8) -> List[Dict]:
+        """Analyze slides in groups of k per chat-completion request.
+
+        Packing several slides into one request shares the instruction
+        tokens across the group and consumes one RPM slot instead of k,
+        which matters on large decks under account rate limits.
+
+        Args:
+            slides: List of slide data dictionaries
+            k: Number of slides per request
+
+        Returns:
+            List of per-slide analysis dictionaries in slide order
+        """
+        groups = [slides[i:i + k] for i in range(0, len(slides), k)]
+        group_results = await asyncio.gather(
+            *(self._analyze_slide_group(group) for group in groups),
+            return_exceptions=True,
+        )
+
+        results = []
+        for group, group_result in zip(groups, group_results):
+            if isinstance(group_result, Exception):
+                logger.error(f"Error analyzing slide group: {str(group_result)}")
+                group_result = [
+                    {"slide_number": s.get("slide_number"), "error": str(group_result)}
+                    for s in group
+                ]
+            results.extend(group_result)
+        return results
+
+    async def _analyze_slide_group(self, group: List[Dict]) -> List[Dict]:
+        """Analyze one group of slides with a single completion.
+
+        Args:
+            group: Slides to pack into one request
+
+        Returns:
+            List of per-slide analysis dictionaries for the group
+        """
+        sections = "\n\n".join(
+            f"### Slide {s.get('slide_number')}\n"
+            f"Title: {s.get('title', '')}\n"
+            f"Content: {s.get('text_content', '')}"
+            for s in group
+        )
+        prompt = _SLIDE_GROUP_INSTRUCTIONS + sections
+
+        response = await self._chat_completion_async(
+            estimated_tokens=500 * len(group),
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": _SLIDE_EXPERT_SYSTEM},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.0,
+            response_format={"type": "json_object"},
+            max_tokens=150 * len(group),
+        )
+
+        content = response.choices[0].message.content
+        try:
+            start = content.find("[")
+            end = content.rfind("]") + 1
+            entries = json.loads(content[start:end])
+            by_number = {e.get("slide_number"): e for e in entries if isinstance(e, dict)}
+            return [
+                {
+                    "slide_number": s.get("slide_number"),
+                    "analysis": by_number.get(s.get("slide_number"), {}),
+                }
+                for s in group
+            ]
+        except (ValueError, TypeError) as e:
+            # Unparseable group response; fall back to per-slide calls
+            logger.warning(f"Could not parse grouped analysis, retrying per slide: {str(e)}")
+            return list(await asyncio.gather(
+                *(self.analyze_slide_async(s) for s in group)
+            ))
+
+    def submit_batch(self, slides_data: List[Dict]) -> str:
+        """Submit per-slide analyses through the OpenAI Batch API.
+
+        Batch jobs complete within 24 hours at half the token cost, which
+        fits this app's model of retrieving reports later via
+        /api/report/{job_id}.
+
+        Args:
+            slides_data: List of slide data dictionaries
+
+        Returns:
+            The OpenAI batch id
+        """
+        import json
+
+        lines = []
+        for slide in slides_data:
+            lines.append(json.dumps({
+                "custom_id": f"slide-{slide.get('slide_number')}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": "gpt-3.5-turbo",
+                    "messages": self._build_slide_messages(slide),
+                    "temperature": 0.0,
+                    "response_format": {"type": "json_object"},
+                    "max_tokens": 140,
+                },
+            }))
+
+        client = get_sync_client()
+        batch_file = client.files.create(
+            file=("slides_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+
+        logger.info(f"Submitted batch {batch.id} with {len(slides_data)} slides")
+        return batch.id
+
+    def retrieve_batch_results(self, batch_id: str) -> Dict:
+        """Poll a batch job and collect its results when completed.
+
+        Args:
+            batch_id: OpenAI batch id returned by submit_batch
+
+        Returns:
+            Dictionary with the batch status and, once completed, per-slide
+            analysis results ordered by slide number
+        """
+        import json
+
+        client = get_sync_client()
+        batch = client.batches.retrieve(batch_id)
+
+        if batch.status != "completed":
+            return {"status": batch.status, "results": None}
+
+        results = []
+        output = client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            custom_id = record.get("custom_id", "")
+            try:
+                slide_number = int(custom_id.rsplit("-", 1)[1])
+            except (IndexError, ValueError):
+                slide_number = None
+            body = record.get("response", {}).get("body", {})
+            choices = body.get("choices", [])
+            content = choices[0].get("message", {}).get("content", "") if choices else ""
+            results.append({
+                "slide_number": slide_number,
+                "analysis": content,
+            })
+
+        results.sort(key=lambda r: (r["slide_number"] is None, r["slide_number"]))
+        return {"status": "completed", "results": results}
+
+    def _build_slide_messages(self, slide_data: Dict) -> List[Dict]:
+        """Build the chat messages for a single-slide analysis request.
+
+        Args:
+            slide_data: Dictionary containing slide data
+
+        Returns:
+            List of message dictionaries for the chat completions API
+        """
+        slide_text = slide_data.get("text_content", "")
+        title = slide_data.get("title", "")
+
+        prompt = _SLIDE_RATING_INSTRUCTIONS + f"Title: {title}\nContent: {slide_text}"
+
+        return [
+            {"role": "system", "content": _SLIDE_EXPERT_SYSTEM},
+            {"role": "user", "content": prompt}
+        ]
 
     def analyze_slide_content(self, slide_data: Dict) -> Dict:
         """Analyze content quality of a slide.
@@ -30,36 +515,41 @@ class AIAnalyzer:
             title = slide_data.get("title", "")
             word_count = slide_data.get("word_count", 0)
             
-            prompt = f"""
-            Analyze this PowerPoint slide and provide constructive feedback:
-            
-            Title: {title}
-            Content: {slide_text}
-            Word Count: {word_count}
-            
-            Please provide:
-            1. Content Clarity Score (0-100)
-            2. Engagement Score (0-100)
-            3. Key strengths (list 2-3 points)
-            4. Areas for improvement (list 2-3 points)
-            5. Specific suggestions for enhancement
-            
-            Format response as JSON.
-            """
-            
-            response = self.client.chat.completions.create(
+            prompt = (
+                _SLIDE_ANALYSIS_INSTRUCTIONS
+                + f"Title: {title}\nContent: {slide_text}\nWord Count: {word_count}"
+            )
+
+            system_prompt = _SLIDE_COACH_SYSTEM
+            cache_key = PromptCache.make_key("gpt-3.5-turbo", system_prompt, prompt)
+            cached, embedding = self._cache_lookup(cache_key, prompt)
+            if cached is not None:
+                logger.info(f"Prompt cache hit for slide {slide_data.get('slide_number')}")
+                return {
+                    "slide_number": slide_data.get("slide_number"),
+                    "ai_feedback": cached,
+                    "model_used": "gpt-3.5-turbo",
+                }
+
+            response = get_sync_client().chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {"role": "system", "content": "You are an expert presentation coach."},
+                    {"role": "system", "content": system_prompt},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7,
-                max_tokens=500,
+                temperature=0.0,
+                response_format={"type": "json_object"},
+                max_tokens=220,
             )
-            
+
+            ai_feedback = response.choices[0].message.content
+            _prompt_cache.put(cache_key, ai_feedback)
+            if embedding is not None:
+                _prompt_cache.put_embedding(embedding, ai_feedback)
+
             analysis = {
                 "slide_number": slide_data.get("slide_number"),
-                "ai_feedback": response.choices[0].message.content,
+                "ai_feedback": ai_feedback,
                 "model_used": "gpt-3.5-turbo",
             }
             
@@ -84,45 +574,37 @@ class AIAnalyzer:
             Dictionary with presentation-level analysis
         """
         try:
-            # Extract key information from all slides
-            titles = [s.get("title", "") for s in slides_data]
-            total_words = sum(s.get("word_count", 0) for s in slides_data)
-            avg_words = total_words // len(slides_data) if slides_data else 0
-            
-            slide_summary = "\n".join([f"Slide {s['slide_number']}: {s['title']}" for s in slides_data])
-            
-            prompt = f"""
-            Analyze this presentation's overall structure and flow:
-            
-            Total Slides: {len(slides_data)}
-            Average Words per Slide: {avg_words}
-            
-            Slide Outline:
-            {slide_summary}
-            
-            Please evaluate:
-            1. Logical Flow Score (0-100)
-            2. Message Clarity Score (0-100)
-            3. Presentation Coherence Score (0-100)
-            4. Overall Assessment (brief paragraph)
-            5. Top 3 Recommendations for improvement
-            
-            Format response as JSON.
-            """
-            
-            response = self.client.chat.completions.create(
+            # Extract key information from all slides in one pass
+            total_words = 0
+            slide_count = 0
+            for s in slides_data:
+                total_words += s.get("word_count", 0)
+                slide_count += 1
+            avg_words = total_words // slide_count if slide_count else 0
+            
+            slide_summary = "\n".join(f"Slide {s['slide_number']}: {s['title']}" for s in slides_data)
+
+            prompt = (
+                _STRUCTURE_INSTRUCTIONS
+                + f"Total Slides: {slide_count}\n"
+                + f"Average Words per Slide: {avg_words}\n\n"
+                + f"Slide Outline:\n{slide_summary}"
+            )
+
+            response = get_sync_client().chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {"role": "system", "content": "You are a presentation strategy expert."},
+                    {"role": "system", "content": _STRUCTURE_SYSTEM},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7,
-                max_tokens=600,
+                temperature=0.0,
+                response_format={"type": "json_object"},
+                max_tokens=320,
             )
             
             return {
                 "presentation_structure_analysis": response.choices[0].message.content,
-                "total_slides": len(slides_data),
+                "total_slides": slide_count,
                 "average_slide_length": avg_words,
             }
             
@@ -133,6 +615,57 @@ class AIAnalyzer:
                 "presentation_structure_analysis": "Unable to analyze structure at this time",
             }
 
+    async def analyze_presentation_structure_async(self, slides_data: List[Dict]) -> Dict:
+        """Async version of structure analysis, suitable for asyncio.gather.
+
+        Args:
+            slides_data: List of slide data dictionaries
+
+        Returns:
+            Dictionary with presentation-level analysis
+        """
+        try:
+            # Extract key information from all slides in one pass
+            total_words = 0
+            slide_count = 0
+            for s in slides_data:
+                total_words += s.get("word_count", 0)
+                slide_count += 1
+            avg_words = total_words // slide_count if slide_count else 0
+
+            slide_summary = "\n".join(f"Slide {s['slide_number']}: {s['title']}" for s in slides_data)
+
+            prompt = (
+                _STRUCTURE_INSTRUCTIONS
+                + f"Total Slides: {slide_count}\n"
+                + f"Average Words per Slide: {avg_words}\n\n"
+                + f"Slide Outline:\n{slide_summary}"
+            )
+
+            response = await self._chat_completion_async(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": _STRUCTURE_SYSTEM},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.0,
+                response_format={"type": "json_object"},
+                max_tokens=320,
+            )
+
+            return {
+                "presentation_structure_analysis": response.choices[0].message.content,
+                "total_slides": slide_count,
+                "average_slide_length": avg_words,
+            }
+
+        except Exception as e:
+            logger.error(f"Error analyzing presentation structure: {str(e)}")
+            return {
+                "error": str(e),
+                "presentation_structure_analysis": "Unable to analyze structure at this time",
+            }
+
     def generate_suggestions(self, slide_analysis: Dict) -> List[str]:
         """Generate specific, actionable suggestions for a slide.
         
@@ -146,29 +679,17 @@ class AIAnalyzer:
             content = slide_analysis.get("text_content", "")
             title = slide_analysis.get("title", "")
             
-            prompt = f"""
-            Provide 5 specific, actionable suggestions to improve this slide:
-            
-            Title: {title}
-            Content: {content}
-            
-            Focus on:
-            - Visual improvements
-            - Content clarity
-            - Audience engagement
-            - Design best practices
-            
-            Return as a JSON list of strings, where each string is one specific suggestion.
-            """
-            
-            response = self.client.chat.completions.create(
+            prompt = _SUGGESTIONS_INSTRUCTIONS + f"Title: {title}\nContent: {content}"
+
+            response = get_sync_client().chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {"role": "system", "content": "You are a professional presentation designer."},
+                    {"role": "system", "content": _DESIGNER_SYSTEM},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7,
-                max_tokens=400,
+                temperature=0.0,
+                response_format={"type": "json_object"},
+                max_tokens=180,
             )
             
             # Parse response and extract suggestions
@@ -188,27 +709,36 @@ class AIAnalyzer:
         Returns:
             List of suggestions
         """
-        try:
-            import json
-            # Try to extract JSON from response
-            start = response_text.find("[")
-            end = response_text.rfind("]") + 1
-            if start != -1 and end > start:
-                json_str = response_text[start:end]
-                return json.loads(json_str)
-        except Exception as e:
-            logger.warning(f"Could not parse suggestions as JSON: {str(e)}")
-        
-        # Fallback: split by common delimiters
+        # Single scan tracking bracket depth finds the outermost JSON
+        # array even when the model nests brackets or wraps the payload
+        # in code fences
+        start = 0
+        depth = 0
+        for i, ch in enumerate(response_text):
+            if ch == "[":
+                if depth == 0:
+                    start = i
+                depth += 1
+            elif ch == "]" and depth:
+                depth -= 1
+                if depth == 0:
+                    try:
+                        parsed = orjson.loads(response_text[start:i + 1])
+                        if isinstance(parsed, list):
+                            return parsed
+                    except orjson.JSONDecodeError as e:
+                        logger.warning(f"Could not parse suggestions as JSON: {str(e)}")
+                    break
+
+        # Fallback: pull numbered lines
         suggestions = []
         for line in response_text.split("\n"):
-            line = line.strip()
-            if line and line[0].isdigit():
-                # Remove numbering
-                suggestion = line.lstrip("0123456789.-) ")
+            match = _NUM_RE.match(line)
+            if match:
+                suggestion = match.group(1).strip()
                 if suggestion:
                     suggestions.append(suggestion)
-        
+
         return suggestions if suggestions else [response_text]
 
     async def analyze_slide_async(self, slide_data: Dict) -> Dict:
@@ -221,30 +751,36 @@ class AIAnalyzer:
             Dictionary with analysis results
         """
         try:
-            slide_text = slide_data.get("text_content", "")
-            title = slide_data.get("title", "")
-            
-            prompt = f"""
-            Analyze this slide and rate its quality (0-100) in: clarity, engagement, design.
-            Title: {title}
-            Content: {slide_text}
-            
-            Respond with JSON: {{"clarity": X, "engagement": Y, "design": Z, "feedback": "..."}}
-            """
-            
-            response = await self.async_client.chat.completions.create(
+            messages = self._build_slide_messages(slide_data)
+            cache_key = PromptCache.make_key(
+                "gpt-3.5-turbo", messages[0]["content"], messages[1]["content"]
+            )
+            cached, embedding = await asyncio.to_thread(
+                self._cache_lookup, cache_key, messages[1]["content"]
+            )
+            if cached is not None:
+                logger.info(f"Prompt cache hit for slide {slide_data.get('slide_number')}")
+                return {
+                    "slide_number": slide_data.get("slide_number"),
+                    "analysis": cached,
+                }
+
+            response = await self._chat_completion_async(
                 model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a presentation expert."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=300,
+                messages=messages,
+                temperature=0.0,
+                response_format={"type": "json_object"},
+                max_tokens=140,
             )
-            
+
+            content = response.choices[0].message.content
+            _prompt_cache.put(cache_key, content)
+            if embedding is not None:
+                _prompt_cache.put_embedding(embedding, content)
+
             return {
                 "slide_number": slide_data.get("slide_number"),
-                "analysis": response.choices[0].message.content,
+                "analysis": content,
             }
             
         except Exception as e:
@@ -20,6 +20,20 @@ class Settings(BaseSettings):
     api_version: str = "1.0.0"
     api_description: str = "AI-powered PowerPoint analyzer"
     
+    # OpenAI throughput limits
+    max_concurrent_openai: int = int(os.getenv("MAX_CONCURRENT_OPENAI", "8"))
+    max_requests_per_min: int = int(os.getenv("MAX_REQUESTS_PER_MIN", "500"))
+    max_tokens_per_min: int = int(os.getenv("MAX_TOKENS_PER_MIN", "90000"))
+    # Decks larger than this go through the Batch API (50% token cost)
+    batch_slide_threshold: int = int(os.getenv("BATCH_SLIDE_THRESHOLD", "20"))
+
+    # Job storage (falls back to in-process storage when unset)
+    redis_url: str = os.getenv("REDIS_URL", "")
+
+    # Prompt caching
+    enable_semantic_cache: bool = os.getenv("ENABLE_SEMANTIC_CACHE", "false").lower() == "true"
+    semantic_cache_threshold: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+
     # Logging
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     
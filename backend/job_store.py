@@ -0,0 +1,90 @@
+"""Durable storage for analysis job results.
+
+Job state used to live in a process-local dict, which breaks multi-worker
+deployments (uvicorn --workers N) and grows without bound. This module
+stores payloads in Redis with a TTL when settings.redis_url is configured,
+and falls back to an in-process store with the same TTL semantics so
+single-worker development setups keep working without Redis.
+"""
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+import orjson
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from redis.asyncio import Redis
+except ImportError:
+    Redis = None
+
+DEFAULT_TTL = 86400
+
+_redis: Optional["Redis"] = None
+# Fallback store: job_id -> (expires_at, payload)
+_memory_store: Dict[str, Tuple[float, dict]] = {}
+
+
+def _get_redis():
+    """Get the shared Redis client, or None when Redis is unavailable."""
+    global _redis
+    if Redis is None or not settings.redis_url:
+        return None
+    if _redis is None:
+        _redis = Redis.from_url(settings.redis_url)
+        logger.info("Connected job store to Redis")
+    return _redis
+
+
+def _evict_expired():
+    """Drop expired entries from the in-process fallback store."""
+    now = time.monotonic()
+    for job_id in [k for k, (expires_at, _) in _memory_store.items() if expires_at < now]:
+        del _memory_store[job_id]
+
+
+async def put(job_id: str, payload: dict, ttl: int = DEFAULT_TTL):
+    """Store a job payload under its id with a TTL.
+
+    Args:
+        job_id: Analysis job identifier
+        payload: JSON-serializable job state
+        ttl: Seconds until the entry expires
+    """
+    redis = _get_redis()
+    if redis is not None:
+        await redis.set(f"job:{job_id}", orjson.dumps(payload), ex=ttl)
+        return
+
+    _evict_expired()
+    _memory_store[job_id] = (time.monotonic() + ttl, payload)
+
+
+async def get(job_id: str) -> Optional[dict]:
+    """Fetch a job payload by id.
+
+    Args:
+        job_id: Analysis job identifier
+
+    Returns:
+        The stored payload, or None if missing or expired
+    """
+    redis = _get_redis()
+    if redis is not None:
+        raw = await redis.get(f"job:{job_id}")
+        return orjson.loads(raw) if raw is not None else None
+
+    _evict_expired()
+    entry = _memory_store.get(job_id)
+    return entry[1] if entry is not None else None
+
+
+async def close():
+    """Close the Redis connection (called on application shutdown)."""
+    global _redis
+    if _redis is not None:
+        await _redis.close()
+        _redis = None
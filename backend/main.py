@@ -1,18 +1,21 @@
 """Fully integrated PPT Reviewer Agent - Complete working application."""
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, FileResponse
+import aiofiles
+import asyncio
 import logging
 import os
 import tempfile
 import uuid
-from pathlib import Path
-from typing import Dict
 
 from config import settings
 from ppt_parser import PowerPointParser
 from ai_analyzer import AIAnalyzer
 from report_generator import ReportGenerator
+import job_store
+import openai_transport
 
 # Configure logging
 logging.basicConfig(level=settings.log_level)
@@ -23,6 +26,9 @@ app = FastAPI(
     title=settings.api_title,
     description=settings.api_description,
     version=settings.api_version,
+    # orjson serializes large report payloads several times faster than
+    # stdlib json and emits bytes directly
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -34,14 +40,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for analysis results (in production use database)
-analysis_results: Dict[str, dict] = {}
+# Compress large report payloads; text-heavy JSON shrinks 5-10x
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # Initialize AI analyzer
 ai_analyzer = AIAnalyzer()
 report_gen = ReportGenerator()
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared OpenAI HTTP session and job store."""
+    await openai_transport.close_session()
+    await job_store.close()
+
+
 @app.get("/")
 async def read_root():
     """Root endpoint."""
@@ -59,11 +72,180 @@ async def health_check():
     return {"status": "healthy", "version": settings.api_version}
 
 
-@app.post("/api/analyze")
-async def analyze_presentation(file: UploadFile = File(...)):
-    """Analyze PowerPoint presentation - Main endpoint."""
+# Sentinel marking the end of the parsed-slide stream
+_PARSE_DONE = object()
+
+# Batch API statuses that will never reach "completed"
+_BATCH_FAILURE_STATUSES = ("failed", "expired", "cancelled")
+
+
+async def _analyze_slides_streaming(parser: PowerPointParser, k: int = 8):
+    """Overlap slide parsing with AI analysis.
+
+    Parsing runs in a worker thread, feeding slides through a queue; AI
+    analysis for each group of k slides is dispatched as soon as the
+    group is parsed, so total wall-time is roughly max(parse_time,
+    ai_time) instead of their sum. The structure analysis is started the
+    moment parsing finishes, while slide groups may still be in flight.
+
+    Args:
+        parser: Loaded PowerPointParser to stream slides from
+        k: Slides per grouped analysis request
+
+    Returns:
+        Tuple of (per-slide analysis list, structure analysis dict)
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+
+    def _produce():
+        try:
+            for slide in parser.iter_slides():
+                loop.call_soon_threadsafe(queue.put_nowait, slide)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, _PARSE_DONE)
+
+    producer = asyncio.create_task(asyncio.to_thread(_produce))
+
+    group_tasks = []
+    group = []
+    while True:
+        slide = await queue.get()
+        if slide is _PARSE_DONE:
+            break
+        group.append(slide)
+        if len(group) >= k:
+            group_tasks.append(asyncio.create_task(ai_analyzer.analyze_slides_batch(group, k)))
+            group = []
+    if group:
+        group_tasks.append(asyncio.create_task(ai_analyzer.analyze_slides_batch(group, k)))
+
+    await producer
+
+    # Parsing is done: slides_data is complete, so the structure analysis
+    # can run alongside any still-pending slide groups
+    structure_task = asyncio.create_task(
+        ai_analyzer.analyze_presentation_structure_async(parser.slides_data)
+    )
+
+    analysis_results_list = []
+    group_results = await asyncio.gather(*group_tasks, return_exceptions=True)
+    offset = 0
+    for group_result in group_results:
+        if isinstance(group_result, Exception):
+            logger.error(f"Error analyzing slide group: {str(group_result)}")
+            group_result = [
+                {"slide_number": s.get("slide_number"), "error": str(group_result)}
+                for s in parser.slides_data[offset:offset + k]
+            ]
+        analysis_results_list.extend(group_result)
+        offset += k
+
+    structure_analysis = await structure_task
+    return analysis_results_list, structure_analysis
+
+
+async def _run_job(job_id: str, temp_file: str, filename: str, batch: bool):
+    """Run the full parse/analyze/report pipeline for one upload.
+
+    Executed as a background task after /api/analyze has returned 202;
+    progress is published to the job store for /api/status polling.
+
+    Args:
+        job_id: Analysis job identifier
+        temp_file: Path to the uploaded file on disk
+        filename: Original upload filename
+        batch: Whether the client requested the Batch API path
+    """
+    try:
+        await job_store.put(job_id, {
+            "status": "processing",
+            "filename": filename,
+            "total_slides": 0,
+        })
+
+        # Parse presentation
+        logger.info(f"[{job_id}] Parsing presentation...")
+        parser = await asyncio.to_thread(PowerPointParser, temp_file)
+        slide_count = parser.get_slide_count()
+
+        logger.info(f"[{job_id}] Found {slide_count} slides")
+
+        # Large decks go through the Batch API: half the token cost,
+        # results retrieved later via /api/report/{job_id}
+        if batch or slide_count > settings.batch_slide_threshold:
+            await asyncio.to_thread(parser.extract_all_slides)
+            presentation_data = await asyncio.to_thread(parser.get_all_analysis)
+            logger.info(f"[{job_id}] Submitting {len(parser.slides_data)} slides via Batch API...")
+            batch_id = await asyncio.to_thread(ai_analyzer.submit_batch, parser.slides_data)
+            structure_analysis = await ai_analyzer.analyze_presentation_structure_async(parser.slides_data)
+
+            await job_store.put(job_id, {
+                "status": "batch_submitted",
+                "filename": filename,
+                "total_slides": len(parser.slides_data),
+                "batch_id": batch_id,
+                "presentation_data": presentation_data,
+                "structure_analysis": structure_analysis,
+            })
+            return
+
+        # Parse and analyze as a pipeline: slide groups are dispatched
+        # to the AI as soon as they come off the parser thread, and
+        # the structure analysis runs once parsing completes
+        logger.info(f"[{job_id}] Parsing and analyzing slides...")
+        analysis_results_list, structure_analysis = await _analyze_slides_streaming(parser)
+        presentation_data = await asyncio.to_thread(parser.get_all_analysis)
+
+        # Generate report
+        logger.info(f"[{job_id}] Generating report...")
+        complete_analysis = {
+            "metadata": presentation_data["metadata"],
+            "slides": presentation_data["slides"],
+            "slide_analyses": analysis_results_list,
+            "structure_analysis": structure_analysis,
+        }
+
+        reports = report_gen.generate_all_reports(complete_analysis)
+
+        # Store results
+        await job_store.put(job_id, {
+            "status": "completed",
+            "filename": filename,
+            "total_slides": len(parser.slides_data),
+            "analysis": complete_analysis,
+            "reports": reports,
+        })
+
+        logger.info(f"[{job_id}] Analysis complete!")
+
+    except Exception as e:
+        logger.error(f"[{job_id}] Error analyzing file: {str(e)}")
+        await job_store.put(job_id, {
+            "status": "failed",
+            "filename": filename,
+            "total_slides": 0,
+            "error": str(e),
+        })
+    finally:
+        # Cleanup
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+@app.post("/api/analyze", status_code=202)
+async def analyze_presentation(
+    file: UploadFile = File(...),
+    background_tasks: BackgroundTasks = None,
+    batch: bool = False,
+):
+    """Accept a PowerPoint upload and queue it for analysis.
+
+    Returns 202 immediately with a job_id; clients poll
+    /api/status/{job_id} and fetch results from /api/report/{job_id}.
+    """
     job_id = str(uuid.uuid4())
-    
+
     try:
         # Validate file type
         if not file.filename.endswith(('.pptx', '.ppt')):
@@ -71,92 +253,55 @@ async def analyze_presentation(file: UploadFile = File(...)):
                 status_code=400,
                 detail="Invalid file format. Only .pptx and .ppt files are supported."
             )
-        
-        # Read file content
-        contents = await file.read()
-        file_size_mb = len(contents) / (1024 * 1024)
-        
-        # Validate file size
-        if file_size_mb > settings.max_file_size_mb:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large. Maximum size is {settings.max_file_size_mb}MB."
-            )
-        
-        logger.info(f"[{job_id}] Received file: {file.filename} ({file_size_mb:.2f}MB)")
-        
+
         # Save temporarily
         temp_dir = tempfile.gettempdir()
         temp_file = os.path.join(temp_dir, f"{job_id}_{file.filename}")
-        
-        with open(temp_file, 'wb') as f:
-            f.write(contents)
-        
+
+        # Stream the upload to disk in 1 MiB chunks, enforcing the size
+        # limit as bytes arrive, so peak memory stays constant instead of
+        # buffering the whole file
+        max_bytes = settings.max_file_size_mb * 1024 * 1024
+        size = 0
         try:
-            # Parse presentation
-            logger.info(f"[{job_id}] Parsing presentation...")
-            parser = PowerPointParser(temp_file)
-            parser.extract_all_slides()
-            presentation_data = parser.get_all_analysis()
-            
-            logger.info(f"[{job_id}] Found {len(parser.slides_data)} slides")
-            
-            # Analyze with AI
-            logger.info(f"[{job_id}] Starting AI analysis...")
-            analysis_results_list = []
-            
-            for slide in parser.slides_data:
-                slide_analysis = ai_analyzer.analyze_slide_content(slide)
-                analysis_results_list.append(slide_analysis)
-            
-            # Analyze overall structure
-            structure_analysis = ai_analyzer.analyze_presentation_structure(parser.slides_data)
-            
-            # Generate report
-            logger.info(f"[{job_id}] Generating report...")
-            complete_analysis = {
-                "metadata": presentation_data["metadata"],
-                "slides": presentation_data["slides"],
-                "slide_analyses": analysis_results_list,
-                "structure_analysis": structure_analysis,
-            }
-            
-            reports = report_gen.generate_all_reports(complete_analysis)
-            
-            # Store results
-            analysis_results[job_id] = {
-                "status": "completed",
-                "filename": file.filename,
-                "total_slides": len(parser.slides_data),
-                "analysis": complete_analysis,
-                "reports": reports,
-            }
-            
-            logger.info(f"[{job_id}] Analysis complete!")
-            
-            return {
-                "status": "success",
-                "job_id": job_id,
-                "filename": file.filename,
-                "total_slides": len(parser.slides_data),
-                "message": "Presentation analyzed successfully",
-                "data": {
-                    "metadata": presentation_data["metadata"],
-                    "total_slides": len(parser.slides_data),
-                    "structure_analysis": structure_analysis,
-                }
-            }
-        
-        finally:
-            # Cleanup
+            async with aiofiles.open(temp_file, 'wb') as f:
+                while chunk := await file.read(1 << 20):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"File too large. Maximum size is {settings.max_file_size_mb}MB."
+                        )
+                    await f.write(chunk)
+        except BaseException:
+            # Remove the partial file on any mid-stream failure — the
+            # 413 above, a client disconnect, or a cancelled request
             if os.path.exists(temp_file):
                 os.remove(temp_file)
-    
+            raise
+
+        file_size_mb = size / (1024 * 1024)
+        logger.info(f"[{job_id}] Received file: {file.filename} ({file_size_mb:.2f}MB)")
+
+        await job_store.put(job_id, {
+            "status": "queued",
+            "filename": file.filename,
+            "total_slides": 0,
+        })
+        background_tasks.add_task(_run_job, job_id, temp_file, file.filename, batch)
+
+        return {
+            "status": "queued",
+            "job_id": job_id,
+            "filename": file.filename,
+            "message": "Analysis queued. Poll /api/status/{job_id} and fetch results from /api/report/{job_id}",
+        }
+
     except HTTPException as e:
         logger.error(f"[{job_id}] HTTP Error: {e.detail}")
         raise
     except Exception as e:
-        logger.error(f"[{job_id}] Error analyzing file: {str(e)}")
+        logger.error(f"[{job_id}] Error accepting file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
@@ -164,11 +309,68 @@ async def analyze_presentation(file: UploadFile = File(...)):
 async def get_report(job_id: str, format: str = "json"):
     """Retrieve analysis report."""
     try:
-        if job_id not in analysis_results:
+        result = await job_store.get(job_id)
+        if result is None:
             raise HTTPException(status_code=404, detail="Job not found")
-        
-        result = analysis_results[job_id]
-        
+
+        # Batch jobs are polled lazily: finalize the report on first
+        # retrieval after the batch completes
+        if result.get("status") == "batch_submitted":
+            batch_result = await asyncio.to_thread(
+                ai_analyzer.retrieve_batch_results, result["batch_id"]
+            )
+            if batch_result["status"] in _BATCH_FAILURE_STATUSES:
+                # Terminal: persist the failure so clients stop polling
+                result.pop("presentation_data", None)
+                result["status"] = "failed"
+                result["error"] = (
+                    f"Batch {result['batch_id']} ended with status {batch_result['status']}"
+                )
+                await job_store.put(job_id, result)
+            elif batch_result["status"] != "completed":
+                return ORJSONResponse(
+                    status_code=202,
+                    content={
+                        "status": "batch_pending",
+                        "batch_status": batch_result["status"],
+                        "job_id": job_id,
+                    },
+                )
+            else:
+                presentation_data = result.pop("presentation_data")
+                complete_analysis = {
+                    "metadata": presentation_data["metadata"],
+                    "slides": presentation_data["slides"],
+                    "slide_analyses": batch_result["results"],
+                    "structure_analysis": result["structure_analysis"],
+                }
+                result["analysis"] = complete_analysis
+                result["reports"] = report_gen.generate_all_reports(complete_analysis)
+                result["status"] = "completed"
+                await job_store.put(job_id, result)
+
+        # Reports only exist once the job has completed; tell pollers to
+        # keep waiting (202) or surface the stored failure
+        status = result.get("status")
+        if status == "failed":
+            return ORJSONResponse(
+                status_code=500,
+                content={
+                    "status": "failed",
+                    "job_id": job_id,
+                    "error": result.get("error", "Analysis failed"),
+                },
+            )
+        if status != "completed":
+            return ORJSONResponse(
+                status_code=202,
+                content={
+                    "status": status,
+                    "job_id": job_id,
+                    "message": "Analysis still in progress",
+                },
+            )
+
         if format == "html":
             return FileResponse(
                 content=result["reports"]["html"],
@@ -180,7 +382,7 @@ async def get_report(job_id: str, format: str = "json"):
                 media_type="text/plain"
             )
         else:  # json (default)
-            return JSONResponse(content={
+            return ORJSONResponse(content={
                 "status": result["status"],
                 "filename": result["filename"],
                 "total_slides": result["total_slides"],
@@ -198,13 +400,14 @@ async def get_report(job_id: str, format: str = "json"):
 @app.get("/api/status/{job_id}")
 async def get_status(job_id: str):
     """Get analysis status."""
-    if job_id not in analysis_results:
+    result = await job_store.get(job_id)
+    if result is None:
         return {"status": "not found"}
-    
+
     return {
-        "status": analysis_results[job_id]["status"],
-        "filename": analysis_results[job_id]["filename"],
-        "total_slides": analysis_results[job_id]["total_slides"]
+        "status": result["status"],
+        "filename": result["filename"],
+        "total_slides": result["total_slides"]
     }
 
 
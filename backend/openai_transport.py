@@ -0,0 +1,159 @@
+"""aiohttp-based transport for OpenAI chat completions.
+
+The official AsyncOpenAI client rides on httpx, which scales poorly past a
+few dozen concurrent requests. Since the analyzer fans out one call per
+slide, this module POSTs directly to the chat-completions endpoint over a
+single long-lived aiohttp session with a large connection pool.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+# One session for the app lifetime; created lazily on the running loop and
+# closed from the FastAPI shutdown event
+_session: Optional[aiohttp.ClientSession] = None
+_session_lock = asyncio.Lock()
+
+
+class OpenAITransportError(Exception):
+    """Raised when the OpenAI API returns an error response."""
+
+    def __init__(self, message: str, status_code: int = None, retry_after: float = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class OpenAIRateLimitError(OpenAITransportError):
+    """Raised on HTTP 429 responses from the OpenAI API."""
+
+
+@dataclass
+class ChatMessage:
+    """Message returned by the model."""
+    role: str = "assistant"
+    content: str = ""
+
+
+@dataclass
+class ChatChoice:
+    """Single completion choice."""
+    message: ChatMessage = field(default_factory=ChatMessage)
+    index: int = 0
+    finish_reason: str = ""
+
+
+@dataclass
+class ChatUsage:
+    """Token accounting for a completion."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+
+@dataclass
+class ChatCompletion:
+    """Minimal chat-completion response.
+
+    Mirrors the attribute access the OpenAI SDK exposes
+    (response.choices[0].message.content) so callers keep working.
+    """
+    choices: List[ChatChoice] = field(default_factory=list)
+    usage: ChatUsage = field(default_factory=ChatUsage)
+    model: str = ""
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Get (or lazily create) the shared aiohttp session."""
+    global _session
+    if _session is None or _session.closed:
+        async with _session_lock:
+            if _session is None or _session.closed:
+                _session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=256,
+                        limit_per_host=256,
+                        keepalive_timeout=75,
+                    ),
+                    timeout=aiohttp.ClientTimeout(total=120),
+                )
+                logger.info("Created shared aiohttp session for OpenAI calls")
+    return _session
+
+
+async def close_session():
+    """Close the shared session (called on application shutdown)."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def create_chat_completion(**body) -> ChatCompletion:
+    """POST a chat completion to the OpenAI API.
+
+    Args:
+        **body: Request body fields (model, messages, temperature, ...)
+
+    Returns:
+        ChatCompletion with the parsed response
+
+    Raises:
+        OpenAIRateLimitError: On HTTP 429
+        OpenAITransportError: On any other error response
+    """
+    session = await get_session()
+    headers = {
+        "Authorization": f"Bearer {settings.openai_api_key}",
+        "Content-Type": "application/json",
+    }
+
+    async with session.post(CHAT_COMPLETIONS_URL, json=body, headers=headers) as resp:
+        if resp.status == 429:
+            try:
+                retry_after = float(resp.headers.get("retry-after", "1"))
+            except ValueError:
+                retry_after = 1.0
+            raise OpenAIRateLimitError(
+                f"OpenAI rate limit hit (429)",
+                status_code=429,
+                retry_after=retry_after,
+            )
+
+        payload = await resp.json()
+
+        if resp.status >= 400:
+            message = payload.get("error", {}).get("message", f"HTTP {resp.status}")
+            raise OpenAITransportError(message, status_code=resp.status)
+
+        choices = [
+            ChatChoice(
+                message=ChatMessage(
+                    role=c.get("message", {}).get("role", "assistant"),
+                    content=c.get("message", {}).get("content", ""),
+                ),
+                index=c.get("index", 0),
+                finish_reason=c.get("finish_reason", ""),
+            )
+            for c in payload.get("choices", [])
+        ]
+        usage = payload.get("usage", {})
+
+        return ChatCompletion(
+            choices=choices,
+            usage=ChatUsage(
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+                total_tokens=usage.get("total_tokens", 0),
+            ),
+            model=payload.get("model", ""),
+        )
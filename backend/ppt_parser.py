@@ -1,13 +1,53 @@
 """PowerPoint file parser for extracting content and metadata."""
+import functools
 import os
+import posixpath
+import re
+import zipfile
 from pathlib import Path
 from typing import List, Dict, Tuple
+import numpy as np
+from lxml import etree
 from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.util import Inches, Pt
 import logging
 
 logger = logging.getLogger(__name__)
 
+# OOXML namespaces and tags used by the direct-XML fast path
+_A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+_P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+_SP_TAG = f"{{{_P_NS}}}sp"
+_PIC_TAG = f"{{{_P_NS}}}pic"
+_GRAPHIC_FRAME_TAG = f"{{{_P_NS}}}graphicFrame"
+_GRP_SP_TAG = f"{{{_P_NS}}}grpSp"
+_CXN_SP_TAG = f"{{{_P_NS}}}cxnSp"
+_CNVPR_TAG = f"{{{_P_NS}}}cNvPr"
+_CSLD_TAG = f"{{{_P_NS}}}cSld"
+_PARA_TAG = f"{{{_A_NS}}}p"
+_PPR_TAG = f"{{{_A_NS}}}pPr"
+_RPR_TAG = f"{{{_A_NS}}}rPr"
+_TEXT_TAG = f"{{{_A_NS}}}t"
+
+_SLIDE_XML_RE = re.compile(r"ppt/slides/slide(\d+)\.xml$")
+
+# Shape-name classification, compiled once: a single C-level match per
+# shape instead of repeated .lower() allocations and substring scans
+_NAME_RE = re.compile(r"^(?P<kind>subtitle|title|list)", re.IGNORECASE)
+
+_DENSITY_RECOMMENDATIONS = {
+    "optimal": "Slide has good text-to-visual balance",
+    "too_dense": "Too much text. Consider condensing or splitting into multiple slides.",
+    "too_sparse": "Too little content. Add more information or visuals.",
+}
+
+_CORE_PROPS_NS = {
+    "cp": "http://schemas.openxmlformats.org/package/2006/metadata/core-properties",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "dcterms": "http://purl.org/dc/terms/",
+}
+
 
 class PowerPointParser:
     """Parse PowerPoint files and extract slides, text, and metadata."""
@@ -21,14 +61,40 @@ class PowerPointParser:
         self.file_path = file_path
         self.presentation = None
         self.slides_data = []
+        self._zip = None
+        self._slide_xml_names = []
+        self._layout_names = {}
         self._load_presentation()
 
     def _load_presentation(self):
-        """Load PowerPoint presentation from file."""
+        """Load PowerPoint presentation from file.
+
+        For .pptx files the slide XML parts are read straight from the
+        zip and parsed with lxml, skipping python-pptx's per-shape object
+        model entirely; python-pptx remains the fallback for .ppt files
+        and anything the fast path cannot read.
+        """
         try:
             if not os.path.exists(self.file_path):
                 raise FileNotFoundError(f"File not found: {self.file_path}")
-            
+
+            if self.file_path.lower().endswith(".pptx"):
+                try:
+                    self._zip = zipfile.ZipFile(self.file_path)
+                    slides = []
+                    for name in self._zip.namelist():
+                        match = _SLIDE_XML_RE.match(name)
+                        if match:
+                            slides.append((int(match.group(1)), name))
+                    slides.sort()
+                    self._slide_xml_names = [name for _, name in slides]
+                    logger.info(f"Successfully loaded presentation (direct XML): {self.file_path}")
+                    return
+                except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as e:
+                    logger.warning(f"Direct XML load failed ({str(e)}), falling back to python-pptx")
+                    self._zip = None
+                    self._slide_xml_names = []
+
             self.presentation = Presentation(self.file_path)
             logger.info(f"Successfully loaded presentation: {self.file_path}")
         except Exception as e:
@@ -37,26 +103,61 @@ class PowerPointParser:
 
     def get_slide_count(self) -> int:
         """Get total number of slides."""
+        if self._zip is not None:
+            return len(self._slide_xml_names)
         return len(self.presentation.slides)
 
-    def extract_all_slides(self) -> List[Dict]:
-        """Extract content from all slides.
-        
-        Returns:
-            List of dictionaries containing slide data
+    def iter_slides(self):
+        """Yield slide data dictionaries one at a time as they are parsed.
+
+        Also accumulates slides_data, so callers that need the full list
+        afterwards (metadata, density analysis) can keep using it.
+
+        Yields:
+            Dictionary with slide content and metadata
         """
         self.slides_data = []
-        
+
+        if self._zip is not None:
+            for idx, xml_name in enumerate(self._slide_xml_names):
+                slide_data = self._extract_slide_content_xml(xml_name, idx + 1)
+                self.slides_data.append(slide_data)
+                yield slide_data
+            return
+
         for idx, slide in enumerate(self.presentation.slides):
             slide_data = self._extract_slide_content(slide, idx + 1)
             self.slides_data.append(slide_data)
-        
+            yield slide_data
+
+    def extract_all_slides(self) -> List[Dict]:
+        """Extract content from all slides.
+
+        Returns:
+            List of dictionaries containing slide data
+        """
+        for _ in self.iter_slides():
+            pass
+
         logger.info(f"Extracted {len(self.slides_data)} slides")
         return self.slides_data
 
+    @classmethod
+    def _iter_shapes(cls, shapes):
+        """Yield leaf shapes, descending into groups.
+
+        Matches the XML fast path, which skips the ``grpSp`` container
+        itself and processes each nested shape individually.
+        """
+        for shape in shapes:
+            if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+                yield from cls._iter_shapes(shape.shapes)
+            else:
+                yield shape
+
     def _extract_slide_content(self, slide, slide_number: int) -> Dict:
         """Extract content from a single slide.
-        
+
         Args:
             slide: PowerPoint slide object
             slide_number: Slide number for reference
@@ -79,54 +180,249 @@ class PowerPointParser:
         
         texts = []
         image_count = 0
-        
-        for shape in slide.shapes:
-            # Extract text from shapes
-            if hasattr(shape, "text") and shape.text.strip():
-                texts.append(shape.text)
-                slide_data["text_content"] += shape.text + "\n"
-                
-                # Get font sizes
-                if hasattr(shape, "text_frame"):
-                    for paragraph in shape.text_frame.paragraphs:
-                        for run in paragraph.runs:
-                            if run.font.size:
-                                slide_data["font_sizes"].append(int(run.font.size.pt))
-                
-                # Identify title and subtitle
-                if "title" in shape.name.lower():
-                    slide_data["title"] = shape.text
-                elif "subtitle" in shape.name.lower():
-                    slide_data["subtitle"] = shape.text
-                elif shape.name.startswith("List"):
-                    # Extract bullet points
-                    if hasattr(shape, "text_frame"):
-                        for paragraph in shape.text_frame.paragraphs:
-                            if paragraph.text.strip():
-                                slide_data["bullets"].append({
-                                    "text": paragraph.text,
-                                    "level": paragraph.level,
-                                })
-            
+        shape_count = 0
+
+        for shape in self._iter_shapes(slide.shapes):
+            shape_count += 1
+
             # Count images
-            if shape.shape_type == 13:  # MSO_SHAPE_TYPE.PICTURE
+            if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
                 image_count += 1
-        
+
+            # Extract text from shapes; most shapes have text, so the
+            # except branch is the uncommon path
+            try:
+                text = shape.text
+            except AttributeError:
+                continue
+            if not text.strip():
+                continue
+
+            texts.append(text)
+
+            # Classify the shape once, then walk its paragraphs exactly
+            # once, pulling font sizes (and bullets for list shapes) in
+            # the same pass
+            match = _NAME_RE.match(shape.name)
+            kind = match.group("kind").lower() if match else ""
+            is_list = kind == "list"
+            if kind == "title":
+                slide_data["title"] = text
+            elif kind == "subtitle":
+                slide_data["subtitle"] = text
+
+            try:
+                paragraphs = shape.text_frame.paragraphs
+            except AttributeError:
+                continue
+
+            for paragraph in paragraphs:
+                for run in paragraph.runs:
+                    if run.font.size:
+                        slide_data["font_sizes"].append(int(run.font.size.pt))
+                if is_list and paragraph.text.strip():
+                    slide_data["bullets"].append({
+                        "text": paragraph.text,
+                        "level": paragraph.level,
+                    })
+
         slide_data["images_count"] = image_count
-        slide_data["shapes_count"] = len(slide.shapes)
-        slide_data["word_count"] = len(slide_data["text_content"].split())
-        slide_data["text_content"] = slide_data["text_content"].strip()
-        
+        slide_data["shapes_count"] = shape_count
+
+        text_content = "\n".join(texts)
+        slide_data["word_count"] = len(text_content.split())
+        slide_data["text_content"] = text_content.strip()
+
         return slide_data
 
-    def get_presentation_metadata(self) -> Dict:
-        """Get presentation-level metadata.
-        
+    def _extract_slide_content_xml(self, xml_name: str, slide_number: int) -> Dict:
+        """Extract content from one slide's raw XML part.
+
+        Iterparses the slide XML for shapes, text runs, font sizes, and
+        pictures, producing the same dictionary as _extract_slide_content
+        without constructing python-pptx wrapper objects.
+
+        Args:
+            xml_name: Zip member name of the slide XML part
+            slide_number: Slide number for reference
+
+        Returns:
+            Dictionary with slide content and metadata
+        """
+        slide_data = {
+            "slide_number": slide_number,
+            "text_content": "",
+            "title": "",
+            "subtitle": "",
+            "bullets": [],
+            "images_count": 0,
+            "shapes_count": 0,
+            "font_sizes": [],
+            "word_count": 0,
+            "layout_name": self._get_layout_name(xml_name),
+        }
+
+        texts = []
+        image_count = 0
+        shapes_count = 0
+
+        with self._zip.open(xml_name) as xml_file:
+            for _, elem in etree.iterparse(
+                xml_file,
+                events=("end",),
+                tag=(_SP_TAG, _PIC_TAG, _GRAPHIC_FRAME_TAG, _GRP_SP_TAG, _CXN_SP_TAG),
+            ):
+                if elem.tag == _GRP_SP_TAG:
+                    # Children were already counted when their end events fired
+                    elem.clear()
+                    continue
+                shapes_count += 1
+                if elem.tag == _PIC_TAG:
+                    image_count += 1
+                elif elem.tag == _SP_TAG:
+                    self._extract_shape_xml(elem, slide_data, texts)
+                elem.clear()
+
+        slide_data["images_count"] = image_count
+        slide_data["shapes_count"] = shapes_count
+
+        text_content = "\n".join(texts)
+        slide_data["word_count"] = len(text_content.split())
+        slide_data["text_content"] = text_content.strip()
+
+        return slide_data
+
+    def _extract_shape_xml(self, sp, slide_data: Dict, texts: List[str]):
+        """Pull text, font sizes, and bullets out of one <p:sp> element.
+
+        Args:
+            sp: Parsed <p:sp> element
+            slide_data: Slide dictionary being filled in
+            texts: Accumulator for the slide's shape texts
+        """
+        cnvpr = sp.find(f".//{_CNVPR_TAG}")
+        name = cnvpr.get("name", "") if cnvpr is not None else ""
+
+        paragraphs = []
+        font_sizes = slide_data["font_sizes"]
+        for para in sp.iter(_PARA_TAG):
+            level = 0
+            ppr = para.find(_PPR_TAG)
+            if ppr is not None:
+                try:
+                    level = int(ppr.get("lvl", "0"))
+                except (TypeError, ValueError):
+                    level = 0
+
+            runs = []
+            for el in para.iter():
+                if el.tag == _TEXT_TAG and el.text:
+                    runs.append(el.text)
+                elif el.tag == _RPR_TAG:
+                    sz = el.get("sz")
+                    if sz:
+                        try:
+                            # sz is in hundredths of a point
+                            font_sizes.append(int(sz) // 100)
+                        except ValueError:
+                            pass
+            paragraphs.append(("".join(runs), level))
+
+        text = "\n".join(para_text for para_text, _ in paragraphs)
+        if not text.strip():
+            return
+
+        texts.append(text)
+
+        match = _NAME_RE.match(name)
+        kind = match.group("kind").lower() if match else ""
+        if kind == "title":
+            slide_data["title"] = text
+        elif kind == "subtitle":
+            slide_data["subtitle"] = text
+        elif kind == "list":
+            for para_text, level in paragraphs:
+                if para_text.strip():
+                    slide_data["bullets"].append({
+                        "text": para_text,
+                        "level": level,
+                    })
+
+    def _get_layout_name(self, xml_name: str) -> str:
+        """Resolve a slide part's layout name, cached per layout part.
+
+        Args:
+            xml_name: Zip member name of the slide XML part
+
+        Returns:
+            Layout name string, or "" when it cannot be resolved
+        """
+        try:
+            base = xml_name.rsplit("/", 1)[1]
+            rels_root = etree.fromstring(self._zip.read(f"ppt/slides/_rels/{base}.rels"))
+
+            layout_target = None
+            for rel in rels_root:
+                if rel.get("Type", "").endswith("/slideLayout"):
+                    layout_target = rel.get("Target", "")
+                    break
+            if not layout_target:
+                return ""
+
+            layout_part = posixpath.normpath(posixpath.join("ppt/slides", layout_target))
+            if layout_part not in self._layout_names:
+                layout_root = etree.fromstring(self._zip.read(layout_part))
+                csld = layout_root.find(_CSLD_TAG)
+                self._layout_names[layout_part] = csld.get("name", "") if csld is not None else ""
+            return self._layout_names[layout_part]
+        except (KeyError, IndexError, etree.XMLSyntaxError) as e:
+            logger.warning(f"Could not resolve layout name for {xml_name}: {str(e)}")
+            return ""
+
+    def _get_metadata_from_zip(self) -> Dict:
+        """Read core document properties straight from docProps/core.xml.
+
+        Returns:
+            Dictionary with presentation metadata
+        """
+        props = {}
+        try:
+            root = etree.fromstring(self._zip.read("docProps/core.xml"))
+            for key, tag in (
+                ("title", "dc:title"),
+                ("author", "dc:creator"),
+                ("subject", "dc:subject"),
+                ("keywords", "cp:keywords"),
+                ("created", "dcterms:created"),
+                ("modified", "dcterms:modified"),
+            ):
+                el = root.find(tag, _CORE_PROPS_NS)
+                props[key] = (el.text or "") if el is not None else ""
+        except (KeyError, etree.XMLSyntaxError) as e:
+            logger.warning(f"Could not read core properties: {str(e)}")
+
+        return {
+            "title": props.get("title") or "Untitled",
+            "author": props.get("author") or "Unknown",
+            "subject": props.get("subject") or "",
+            "keywords": props.get("keywords") or "",
+            "total_slides": self.get_slide_count(),
+            "created": props.get("created") or "",
+            "modified": props.get("modified") or "",
+        }
+
+    @functools.cached_property
+    def presentation_metadata(self) -> Dict:
+        """Presentation-level metadata, computed once per parser instance.
+
         Returns:
             Dictionary with presentation metadata
         """
+        if self._zip is not None:
+            return self._get_metadata_from_zip()
+
         core_props = self.presentation.core_properties
-        
+
         return {
             "title": core_props.title or "Untitled",
             "author": core_props.author or "Unknown",
@@ -188,12 +484,7 @@ class PowerPointParser:
 
     def _get_density_recommendation(self, rating: str) -> str:
         """Get recommendation based on density rating."""
-        recommendations = {
-            "optimal": "Slide has good text-to-visual balance",
-            "too_dense": "Too much text. Consider condensing or splitting into multiple slides.",
-            "too_sparse": "Too little content. Add more information or visuals.",
-        }
-        return recommendations.get(rating, "")
+        return _DENSITY_RECOMMENDATIONS.get(rating, "")
 
     def get_all_analysis(self) -> Dict:
         """Get comprehensive analysis of presentation.
@@ -203,17 +494,40 @@ class PowerPointParser:
         """
         if not self.slides_data:
             self.extract_all_slides()
-        
+
         analysis = {
-            "metadata": self.get_presentation_metadata(),
+            "metadata": self.presentation_metadata,
             "slides": [],
         }
-        
-        for slide in self.slides_data:
-            slide_analysis = {
+
+        # Density scoring vectorized across the whole deck: a few array
+        # ops instead of per-slide Python arithmetic
+        count = len(self.slides_data)
+        word_counts = np.fromiter(
+            (s["word_count"] for s in self.slides_data), dtype=np.int32, count=count
+        )
+        image_counts = np.fromiter(
+            (s["images_count"] for s in self.slides_data), dtype=np.int32, count=count
+        )
+        scores = np.minimum(word_counts / 100.0, 1.0) * 100
+        ratings = np.where(
+            word_counts > 150,
+            "too_dense",
+            np.where((word_counts < 20) & (image_counts == 0), "too_sparse", "optimal"),
+        )
+
+        for slide, score, rating in zip(self.slides_data, scores, ratings):
+            rating = str(rating)
+            analysis["slides"].append({
                 **slide,
-                "density_analysis": self.analyze_slide_density(slide),
-            }
-            analysis["slides"].append(slide_analysis)
-        
+                "density_analysis": {
+                    "word_count": slide["word_count"],
+                    "bullet_count": len(slide["bullets"]),
+                    "image_count": slide["images_count"],
+                    "text_density_score": float(score),
+                    "density_rating": rating,
+                    "recommendation": _DENSITY_RECOMMENDATIONS.get(rating, ""),
+                },
+            })
+
         return analysis